@@ -82,7 +82,8 @@ CREATE TABLE lap_times (
     pit_out_time TIMESTAMP,
     is_personal_best BOOLEAN DEFAULT FALSE,
     is_deleted BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(session_id, driver_number, lap_number)
 );
 
 -- Telemetry data table (will be populated by F1 processor)
@@ -143,7 +144,6 @@ CREATE TABLE chat_history (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_lap_times_session_driver ON lap_times(session_id, driver_number);
 CREATE INDEX idx_lap_times_lap_number ON lap_times(lap_number);
 CREATE INDEX idx_telemetry_session_driver ON telemetry_data(session_id, driver_number);
 CREATE INDEX idx_f1_sessions_year_round ON f1_sessions(year, round_number);
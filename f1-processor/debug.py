@@ -5,6 +5,9 @@ Debug version to check environment variable loading
 
 import os
 from dotenv import load_dotenv
+from debug_utils import (
+    read_env_vars, mask_database_url, individual_db_config, CONNECT_TIMEOUT
+)
 
 def debug_environment():
     """Debug environment variables"""
@@ -29,13 +32,9 @@ def debug_environment():
         print(f"❌ .env file not found: {env_file}")
     
     print("\n🔍 Environment variables after loading:")
-    env_vars = [
-        'DATABASE_URL', 'DB_HOST', 'DB_PORT', 'DB_NAME', 
-        'DB_USER', 'DB_PASSWORD', 'REDIS_URL'
-    ]
+    env = read_env_vars()
     
-    for var in env_vars:
-        value = os.getenv(var)
+    for var, value in env.items():
         if value and 'password' in var.lower():
             print(f"   {var}=***")
         else:
@@ -43,27 +42,22 @@ def debug_environment():
     
     # Test individual connection parameters
     print("\n🔗 Connection parameters that will be used:")
-    database_url = os.getenv('DATABASE_URL')
+    database_url = env['DATABASE_URL']
     if database_url:
-        # Mask password in output
-        masked_url = database_url
-        if '@' in masked_url:
-            parts = masked_url.split('@')
-            user_pass = parts[0].split('//')[-1]
-            if ':' in user_pass:
-                user, _ = user_pass.split(':')
-                masked_url = masked_url.replace(user_pass, f"{user}:***")
-        print(f"   DATABASE_URL: {masked_url}")
+        print(f"   DATABASE_URL: {mask_database_url(database_url)}")
     else:
+        db_config = individual_db_config()
         print("   Using individual DB config:")
-        print(f"   Host: {os.getenv('DB_HOST', 'localhost')}")
-        print(f"   Port: {os.getenv('DB_PORT', '5433')}")
-        print(f"   Database: {os.getenv('DB_NAME', 'f1_dashboard')}")
-        print(f"   User: {os.getenv('DB_USER', 'f1_user')}")
+        print(f"   Host: {db_config['host']}")
+        print(f"   Port: {db_config['port']}")
+        print(f"   Database: {db_config['database']}")
+        print(f"   User: {db_config['user']}")
         print(f"   Password: ***")
+    
+    return env
 
 if __name__ == "__main__":
-    debug_environment()
+    env = debug_environment()
     
     # Try connection test
     print("\n🔗 Testing actual database connection...")
@@ -71,26 +65,22 @@ if __name__ == "__main__":
     import psycopg2
     
     # Test with DATABASE_URL
-    database_url = os.getenv('DATABASE_URL')
+    connected = False
+    database_url = env['DATABASE_URL']
     if database_url:
         try:
-            conn = psycopg2.connect(database_url)
+            conn = psycopg2.connect(database_url, connect_timeout=CONNECT_TIMEOUT)
             print("✅ DATABASE_URL connection successful!")
             conn.close()
+            connected = True
         except Exception as e:
             print(f"❌ DATABASE_URL connection failed: {e}")
     
-    # Test with individual config
-    try:
-        db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': int(os.getenv('DB_PORT', '5433')),
-            'database': os.getenv('DB_NAME', 'f1_dashboard'),
-            'user': os.getenv('DB_USER', 'f1_user'),
-            'password': os.getenv('DB_PASSWORD', 'f1_password')
-        }
-        conn = psycopg2.connect(**db_config)
-        print("✅ Individual config connection successful!")
-        conn.close()
-    except Exception as e:
-        print(f"❌ Individual config connection failed: {e}")
\ No newline at end of file
+    # Test with individual config only if DATABASE_URL didn't work
+    if not connected:
+        try:
+            conn = psycopg2.connect(**individual_db_config(), connect_timeout=CONNECT_TIMEOUT)
+            print("✅ Individual config connection successful!")
+            conn.close()
+        except Exception as e:
+            print(f"❌ Individual config connection failed: {e}")
\ No newline at end of file
@@ -1,28 +1,24 @@
-import os
 from dotenv import load_dotenv
+from debug_utils import (
+    read_env_vars, mask_database_url, individual_db_config, CONNECT_TIMEOUT
+)
 
 print("=== Environment Debug ===")
 load_dotenv()
 
-print(f"DATABASE_URL: {os.getenv('DATABASE_URL')}")
-print(f"DB_HOST: {os.getenv('DB_HOST')}")
-print(f"DB_PORT: {os.getenv('DB_PORT')}")
-print(f"DB_USER: {os.getenv('DB_USER')}")
-print(f"DB_PASSWORD: {os.getenv('DB_PASSWORD')}")
-print(f"DB_NAME: {os.getenv('DB_NAME')}")
+for var, value in read_env_vars().items():
+    if value and var == 'DB_PASSWORD':
+        value = '***'
+    elif value and var == 'DATABASE_URL':
+        value = mask_database_url(value)
+    print(f"{var}: {value}")
 
 # Test direct connection
 import psycopg2
 
 configs_to_test = [
     # Using environment variables
-    {
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'port': os.getenv('DB_PORT', '5433'),
-        'database': os.getenv('DB_NAME', 'f1_dashboard'),
-        'user': os.getenv('DB_USER', 'f1_user'),
-        'password': os.getenv('DB_PASSWORD', 'f1_password')
-    },
+    individual_db_config(),
     # Using IPv4 explicitly
     {
         'host': '127.0.0.1',
@@ -37,7 +33,7 @@ for i, config in enumerate(configs_to_test, 1):
     print(f"\n--- Test {i} ---")
     print(f"Trying: {config['user']}@{config['host']}:{config['port']}/{config['database']}")
     try:
-        conn = psycopg2.connect(**config)
+        conn = psycopg2.connect(**config, connect_timeout=CONNECT_TIMEOUT)
         cur = conn.cursor()
         cur.execute("SELECT current_database(), current_user;")
         result = cur.fetchone()
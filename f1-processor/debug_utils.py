@@ -0,0 +1,39 @@
+"""
+Shared helpers for the database debug scripts
+"""
+
+import os
+from urllib.parse import urlsplit
+
+ENV_VARS = (
+    'DATABASE_URL', 'DB_HOST', 'DB_PORT', 'DB_NAME',
+    'DB_USER', 'DB_PASSWORD', 'REDIS_URL'
+)
+
+# Fail fast instead of waiting on the libpq default when the host is down
+CONNECT_TIMEOUT = 2
+
+def read_env_vars():
+    """Snapshot the debug-relevant environment variables in one pass"""
+    return {var: os.environ.get(var) for var in ENV_VARS}
+
+def mask_database_url(database_url):
+    """Return DATABASE_URL with its password replaced by ***"""
+    parts = urlsplit(database_url)
+    if parts.password is None:
+        return database_url
+
+    netloc = f"{parts.username}:***@{parts.hostname}"
+    if parts.port:
+        netloc += f":{parts.port}"
+    return parts._replace(netloc=netloc).geturl()
+
+def individual_db_config():
+    """Database config built from the individual DB_* variables"""
+    return {
+        'host': os.environ.get('DB_HOST', 'localhost'),
+        'port': int(os.environ.get('DB_PORT', '5433')),
+        'database': os.environ.get('DB_NAME', 'f1_dashboard'),
+        'user': os.environ.get('DB_USER', 'f1_user'),
+        'password': os.environ.get('DB_PASSWORD', 'f1_password')
+    }
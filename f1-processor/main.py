@@ -8,15 +8,24 @@ import sys
 import json
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 import redis
 import fastf1
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone
 from contextlib import contextmanager
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from dotenv import load_dotenv
 
+# How long a successful ingest marker keeps a session from being re-processed
+INGEST_MARKER_TTL = 24 * 60 * 60
+
+# FastF1 loads are dominated by HTTP fetches, so overlap a few of them
+SESSION_LOAD_WORKERS = 5
+
 class F1DataProcessor:
     def __init__(self):
         # Load environment variables first
@@ -28,8 +37,9 @@ class F1DataProcessor:
         
     def setup_logging(self):
         """Set up logging"""
+        # LOG_LEVEL=WARNING silences the per-entity debug/info chatter on prod runs
         logging.basicConfig(
-            level=logging.INFO,
+            level=os.getenv('LOG_LEVEL', 'INFO').upper(),
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger(__name__)
@@ -42,7 +52,7 @@ class F1DataProcessor:
         print(f"✅ FastF1 cache directory: {cache_dir}")
         
     def setup_connections(self):
-        """Set up database and Redis connections"""
+        """Set up the database connection"""
         # Try DATABASE_URL first, then fall back to individual env vars
         database_url = os.getenv('DATABASE_URL')
         
@@ -51,9 +61,9 @@ class F1DataProcessor:
             print(f"🔗 Using DATABASE_URL: {database_url.replace(os.getenv('DB_PASSWORD', ''), '***')}")
             try:
                 self.db_conn_str = database_url
-                # Test connection
-                test_conn = psycopg2.connect(database_url)
-                test_conn.close()
+                # The pool opens its first connection up front, so this doubles
+                # as the connection check
+                self.setup_connection_pool()
                 print("✅ Database connection successful via DATABASE_URL")
             except Exception as e:
                 print(f"❌ DATABASE_URL connection failed: {e}")
@@ -61,17 +71,20 @@ class F1DataProcessor:
                 self.setup_individual_db_config()
         else:
             self.setup_individual_db_config()
-        
-        # Redis connection with correct port
+    
+    @cached_property
+    def redis_client(self):
+        """Redis connection, opened on first use (None if unreachable)"""
         redis_url = os.getenv('REDIS_URL', 'redis://localhost:6380')  # Fixed port
         try:
-            self.redis_client = redis.from_url(redis_url)
-            self.redis_client.ping()
+            client = redis.from_url(redis_url, decode_responses=True)
+            client.ping()
             print(f"✅ Redis connection successful: {redis_url}")
+            return client
         except Exception as e:
             print(f"❌ Redis connection failed: {e}")
             print(f"🔍 Tried connecting to: {redis_url}")
-            self.redis_client = None
+            return None
     
     def setup_individual_db_config(self):
         """Set up database config using individual environment variables"""
@@ -83,35 +96,39 @@ class F1DataProcessor:
             'password': os.getenv('DB_PASSWORD', 'f1_password')
         }
         
+        self.db_conn_str = None  # Use db_config instead
+        
         try:
-            # Test connection with individual config
-            test_conn = psycopg2.connect(**self.db_config)
-            test_conn.close()
+            self.setup_connection_pool()
             print(f"✅ Database connection successful: {self.db_config['host']}:{self.db_config['port']}")
-            self.db_conn_str = None  # Use db_config instead
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             print(f"🔍 Tried connecting to: {self.db_config}")
             raise
             
+    def setup_connection_pool(self):
+        """Set up a connection pool so sessions reuse connections instead of reconnecting"""
+        if self.db_conn_str:
+            self.db_pool = psycopg2.pool.ThreadedConnectionPool(1, 4, self.db_conn_str)
+        else:
+            self.db_pool = psycopg2.pool.ThreadedConnectionPool(1, 4, **self.db_config)
+            
     @contextmanager
     def get_db_connection(self):
-        """Get database connection with proper error handling"""
+        """Get pooled database connection with proper error handling"""
         conn = None
         try:
-            if hasattr(self, 'db_conn_str') and self.db_conn_str:
-                conn = psycopg2.connect(self.db_conn_str)
-            else:
-                conn = psycopg2.connect(**self.db_config)
+            conn = self.db_pool.getconn()
             conn.autocommit = False  # Use explicit transactions
             yield conn
         except Exception as e:
-            if conn:
+            if conn and not conn.closed:
                 conn.rollback()
             raise e
         finally:
             if conn:
-                conn.close()
+                # The pool rolls back anything left uncommitted and drops closed connections
+                self.db_pool.putconn(conn)
                 
     def test_database_connection(self):
         """Test database connection and schema"""
@@ -137,6 +154,23 @@ class F1DataProcessor:
                     print(f"✅ Found {len(tables)} tables:")
                     for table in tables:
                         print(f"   - {table['table_name']}")
+                    
+                    # The lap upsert needs a unique index matching its ON CONFLICT target
+                    cur.execute("""
+                        SELECT 1
+                        FROM pg_index i
+                        JOIN pg_class c ON c.oid = i.indrelid
+                        WHERE c.relname = 'lap_times'
+                          AND i.indisunique
+                          AND i.indkey::text = (
+                              SELECT string_agg(a.attnum::text, ' ' ORDER BY k.ord)
+                              FROM unnest(ARRAY['session_id', 'driver_number', 'lap_number'])
+                                   WITH ORDINALITY AS k(name, ord)
+                              JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = k.name
+                          );
+                    """)
+                    if cur.fetchone() is None:
+                        print("⚠️ lap_times has no UNIQUE (session_id, driver_number, lap_number) index - lap upserts will fail")
                         
         except Exception as e:
             print(f"❌ Database connection test failed: {e}")
@@ -164,119 +198,187 @@ class F1DataProcessor:
         ]
         
         processed_count = 0
+        skipped_count = 0
         failed_count = 0
         
+        pending_sessions = []
         for year, location, session_type in sessions_to_process:
-            try:
-                print(f"\n🔄 Processing {year} {location} {session_type}...")
-                
-                # Try to load the session
-                session = fastf1.get_session(year, location, session_type)
-                session.load()
-                
-                print(f"✅ Loaded session: {session.event['EventName']} - {session.name}")
-                print(f"📊 Found {len(session.drivers)} drivers")
+            ingest_key = f"f1:ingested:{year}:{location}:{session_type}"
+            if self.is_session_ingested(ingest_key):
+                print(f"\n⏭️ Skipping {year} {location} {session_type} - already ingested")
+                skipped_count += 1
+                continue
+            pending_sessions.append((year, location, session_type))
+        
+        # Download sessions concurrently; database writes stay on this thread
+        with ThreadPoolExecutor(max_workers=SESSION_LOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(self.load_session, year, location, session_type): (year, location, session_type)
+                for year, location, session_type in pending_sessions
+            }
+            
+            for future in as_completed(futures):
+                # Drop our reference so each loaded session can be freed once stored
+                year, location, session_type = futures.pop(future)
+                ingest_key = f"f1:ingested:{year}:{location}:{session_type}"
                 
-                # Process and store in database
-                with self.get_db_connection() as conn:
-                    # Convert numpy types from session event data
-                    session_year = self.convert_numpy_types(year)
-                    round_number = self.convert_numpy_types(session.event['RoundNumber'])
-                    event_name = str(session.event['EventName'])
-                    
-                    session_id = self.create_session_record(
-                        conn, session_year, round_number, 
-                        session_type, event_name
-                    )
-                    
-                    # Store drivers
-                    for driver_number in session.drivers:
-                        driver_info = session.get_driver(driver_number)
-                        self.store_driver_info(conn, driver_info, event_name)
+                try:
+                    session = future.result()
                     
-                    # Store some lap times (sample)
-                    self.store_sample_lap_times(conn, session_id, session)
+                    print(f"\n✅ Loaded session: {session.event['EventName']} - {session.name}")
+                    print(f"📊 Found {len(session.drivers)} drivers")
                     
-                    conn.commit()
-                    print(f"✅ Successfully processed session {session_id}")
-                    processed_count += 1
+                    # Process and store in database
+                    # One cursor serves every statement in the session's transaction
+                    with self.get_db_connection() as conn, conn.cursor() as cur:
+                        # The whole session is one transaction; it can be rebuilt from
+                        # the FastF1 cache, so don't wait on the WAL flush at commit
+                        cur.execute("SET LOCAL synchronous_commit = OFF")
+                        
+                        # Convert numpy types from session event data
+                        session_year = self.convert_numpy_types(year)
+                        round_number = self.convert_numpy_types(session.event['RoundNumber'])
+                        event_name = str(session.event['EventName'])
+                        
+                        session_id = self.create_session_record(
+                            cur, session_year, round_number, 
+                            session_type, event_name
+                        )
+                        
+                        # Store drivers - one pass over the results frame instead of a
+                        # get_driver lookup per driver
+                        drivers_stored = self.store_drivers(cur, session.results)
+                        
+                        # Store some lap times (sample)
+                        laps_stored = self.store_sample_lap_times(cur, session_id, session)
+                        
+                        # Don't commit (or mark as ingested) a session that is missing
+                        # data or whose transaction was aborted by a failed statement
+                        if not (drivers_stored and laps_stored):
+                            raise RuntimeError("driver or lap data was not stored")
+                        if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+                            raise RuntimeError("session transaction was aborted")
+                        
+                        conn.commit()
+                        print(f"✅ Successfully processed session {session_id}")
+                        processed_count += 1
                     
-            except Exception as e:
-                print(f"❌ Failed to process {year} {location} {session_type}: {e}")
-                failed_count += 1
-                continue
+                    self.mark_session_ingested(ingest_key, session_id, len(session.laps))
+                        
+                except Exception as e:
+                    print(f"❌ Failed to process {year} {location} {session_type}: {e}")
+                    failed_count += 1
+                    continue
         
         print(f"\n📊 Processing Summary:")
         print(f"✅ Successfully processed: {processed_count} sessions")
+        print(f"⏭️ Already ingested: {skipped_count} sessions")
         print(f"❌ Failed to process: {failed_count} sessions")
         
-        return processed_count > 0
+        return processed_count + skipped_count > 0
+    
+    def load_session(self, year, location, session_type):
+        """Fetch and load a FastF1 session (runs on a worker thread)"""
+        print(f"🔄 Loading {year} {location} {session_type}...")
+        session = fastf1.get_session(year, location, session_type)
+        session.load()
+        return session
+    
+    def is_session_ingested(self, ingest_key):
+        """Check for the Redis marker left by an earlier successful ingest"""
+        if not self.redis_client:
+            return False
+        try:
+            return bool(self.redis_client.exists(ingest_key))
+        except redis.RedisError as e:
+            print(f"⚠️ Redis lookup failed, processing anyway: {e}")
+            return False
+    
+    def mark_session_ingested(self, ingest_key, session_id, lap_count):
+        """Record a successful ingest so re-runs can skip the session"""
+        if not self.redis_client:
+            return
+        try:
+            marker = json.dumps({'session_id': session_id, 'laps': lap_count})
+            self.redis_client.set(ingest_key, marker, ex=INGEST_MARKER_TTL)
+        except redis.RedisError as e:
+            print(f"⚠️ Could not record ingest marker: {e}")
 
-    def store_sample_lap_times(self, conn, session_id, session):
-        """Store sample lap times for the session"""
+    def store_sample_lap_times(self, cur, session_id, session):
+        """Store sample lap times for the session; returns False if they couldn't be stored"""
         try:
             print(f"💾 Storing lap times for session {session_id}...")
             
             # Get laps data for first few drivers
-            sample_drivers = list(session.drivers)[:5]  # Process first 5 drivers
+            sample_drivers = session.drivers[:5]  # Process first 5 drivers
+            # Carry only the columns the upsert needs through the filter and groupby
+            # (pick_drivers matches on both Driver and DriverNumber)
+            lap_columns = ['Driver', 'DriverNumber', 'LapNumber', 'LapTime', 'Compound', 'TyreLife', 'Position']
+            laps = session.laps[[col for col in lap_columns if col in session.laps.columns]]
+            driver_laps = laps.pick_drivers(sample_drivers)
             
-            for driver_number in sample_drivers:
-                try:
-                    driver_laps = session.laps.pick_driver(driver_number)
-                    
-                    if len(driver_laps) == 0:
-                        continue
-                        
-                    # Store first 10 laps for each driver
-                    for i, lap in driver_laps.head(10).iterrows():
-                        lap_time = self.convert_numpy_types(lap.get('LapTime', None))
-                        lap_number = self.convert_numpy_types(lap.get('LapNumber', i + 1))
-                        
-                        # Convert timedelta to seconds if present
-                        if lap_time and hasattr(lap_time, 'total_seconds'):
-                            lap_time = lap_time.total_seconds()
-                        elif lap_time and str(lap_time) != 'nan':
-                            lap_time = float(lap_time)
-                        else:
-                            lap_time = None
-                        
-                        with conn.cursor() as cur:
-                            cur.execute("""
-                                INSERT INTO lap_times (
-                                    session_id, driver_number, lap_number, lap_time,
-                                    sector1_time, sector2_time, sector3_time,
-                                    compound, tyre_life, position
-                                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (session_id, driver_number, lap_number) 
-                                DO UPDATE SET
-                                    lap_time = EXCLUDED.lap_time,
-                                    sector1_time = EXCLUDED.sector1_time,
-                                    sector2_time = EXCLUDED.sector2_time,
-                                    sector3_time = EXCLUDED.sector3_time,
-                                    compound = EXCLUDED.compound,
-                                    tyre_life = EXCLUDED.tyre_life,
-                                    position = EXCLUDED.position
-                            """, (
-                                session_id,
-                                str(driver_number),
-                                lap_number,
-                                lap_time,
-                                None,  # sector times - would need additional processing
-                                None,
-                                None,
-                                str(lap.get('Compound', 'UNKNOWN'))[:10] if lap.get('Compound') else None,
-                                self.convert_numpy_types(lap.get('TyreLife', None)),
-                                self.convert_numpy_types(lap.get('Position', None))
-                            ))
-                            
-                except Exception as driver_error:
-                    print(f"⚠️ Could not process laps for driver {driver_number}: {driver_error}")
-                    continue
+            # First 10 laps for each driver in one groupby pass instead of a
+            # pick_driver scan per driver
+            sample = driver_laps.dropna(subset=['LapNumber']).groupby('DriverNumber', sort=False).head(10)
+            # Tyre columns can be missing from older timing data; check once and
+            # fill them as all-NA rather than guarding every row
+            missing = [col for col in ('Compound', 'TyreLife') if col not in sample.columns]
+            if missing:
+                sample = sample.assign(**{col: pd.NA for col in missing})
+            compound = sample['Compound'].astype('string').str[:10]
+            lap_frame = pd.DataFrame({
+                'driver_number': sample['DriverNumber'].astype(str),
+                'lap_number': sample['LapNumber'].astype('Int64'),
+                'lap_time': sample['LapTime'].dt.total_seconds(),
+                'compound': compound.mask(compound == ''),
+                'tyre_life': sample['TyreLife'].astype('Int64'),
+                'position': sample['Position'].astype('Int64')
+            })
+            # NaN/NaT/<NA> -> None so psycopg2 sends NULL
+            lap_frame = lap_frame.astype(object).where(lap_frame.notna(), None)
+            
+            rows = [
+                (
+                    session_id,
+                    driver_number,
+                    lap_number,
+                    lap_time,
+                    None,  # sector times - would need additional processing
+                    None,
+                    None,
+                    compound,
+                    tyre_life,
+                    position
+                )
+                for driver_number, lap_number, lap_time, compound, tyre_life, position
+                in lap_frame.itertuples(index=False, name=None)
+            ]
+            
+            # Send every sampled lap in a single multi-row upsert
+            if rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO lap_times (
+                        session_id, driver_number, lap_number, lap_time,
+                        sector1_time, sector2_time, sector3_time,
+                        compound, tyre_life, position
+                    ) VALUES %s
+                    ON CONFLICT (session_id, driver_number, lap_number) 
+                    DO UPDATE SET
+                        lap_time = EXCLUDED.lap_time,
+                        sector1_time = EXCLUDED.sector1_time,
+                        sector2_time = EXCLUDED.sector2_time,
+                        sector3_time = EXCLUDED.sector3_time,
+                        compound = EXCLUDED.compound,
+                        tyre_life = EXCLUDED.tyre_life,
+                        position = EXCLUDED.position
+                """, rows, page_size=500)
             
-            print(f"✅ Stored lap times for {len(sample_drivers)} drivers")
+            print(f"✅ Stored {len(rows)} lap times for {lap_frame['driver_number'].nunique()} drivers")
+            return True
             
         except Exception as e:
             print(f"❌ Error storing lap times: {e}")
+            return False
 
     def get_available_sessions(self, year):
         """Get list of available sessions for a year"""
@@ -294,20 +396,23 @@ class F1DataProcessor:
             
             available_sessions = []
             
+            # Fetch the season schedule once and resolve each location against it,
+            # rather than letting get_session rebuild the schedule per location
+            schedule = fastf1.get_event_schedule(year, include_testing=False)
+            
             for location in common_locations[:10]:  # Check first 10 to avoid too many requests
                 try:
-                    # Try to get session info (this will fail if not available)
-                    session = fastf1.get_session(year, location, 'R')
-                    
-                    # This will raise an exception if no data available
-                    session_info = session.event
+                    # Same fuzzy event lookup get_session uses
+                    session_info = schedule.get_event_by_name(location)
+                    if session_info is None:
+                        continue
                     
                     available_sessions.append({
                         'location': location,
                         'event_name': session_info.get('EventName', location),
                         'round': session_info.get('RoundNumber', 0)
                     })
-                    print(f"✅ Found: {location}")
+                    self.logger.debug("Found event for %s", location)
                     
                 except Exception:
                     # Session not available - skip
@@ -320,108 +425,110 @@ class F1DataProcessor:
             print(f"❌ Error checking available sessions: {e}")
             return []
     
-    def create_session_record(self, conn, year, round_number, session_type, event_name):
+    def create_session_record(self, cur, year, round_number, session_type, event_name):
         """Create session record and return session ID"""
         try:
             # Convert numpy types to Python types
             year = self.convert_numpy_types(year)
             round_number = self.convert_numpy_types(round_number)
             
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                # Check if session already exists
-                cur.execute("""
-                    SELECT id FROM f1_sessions 
-                    WHERE year = %s AND round_number = %s AND session_type = %s
-                """, (year, round_number, session_type))
-                
-                existing_session = cur.fetchone()
-                
-                if existing_session:
-                    session_id = existing_session['id']
-                    print(f"✅ Found existing session ID: {session_id}")
-                else:
-                    # Create new session
-                    cur.execute("""
-                        INSERT INTO f1_sessions (year, round_number, session_type, event_name, is_processed)
-                        VALUES (%s, %s, %s, %s, %s)
-                        RETURNING id
-                    """, (year, round_number, session_type, event_name, True))
-                    
-                    result = cur.fetchone()
-                    session_id = result['id']
-                    print(f"✅ Created session ID: {session_id}")
-                
-                return session_id
-                
+            # Create the session or fetch the existing one in a single round-trip;
+            # xmax = 0 only for a freshly inserted row
+            cur.execute("""
+                INSERT INTO f1_sessions (year, round_number, session_type, event_name, is_processed)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (year, round_number, session_type)
+                DO UPDATE SET event_name = EXCLUDED.event_name
+                RETURNING id, (xmax = 0) AS inserted
+            """, (year, round_number, session_type, event_name, True))
+            
+            session_id, inserted = cur.fetchone()
+            if inserted:
+                print(f"✅ Created session ID: {session_id}")
+            else:
+                print(f"✅ Found existing session ID: {session_id}")
+            
+            return session_id
+            
         except Exception as e:
             print(f"❌ Error creating session: {e}")
             raise
     
-    def convert_numpy_types(self, value):
+    @staticmethod
+    def convert_numpy_types(value):
         """Convert numpy types to Python native types"""
-        import numpy as np
-        
-        if isinstance(value, np.integer):
-            return int(value)
-        elif isinstance(value, np.floating):
-            return float(value)
-        elif isinstance(value, np.ndarray):
-            return value.tolist()
-        elif hasattr(value, 'item'):  # For numpy scalars
+        # numpy scalars and 0-d arrays all expose .item()
+        try:
             return value.item()
-        else:
+        except AttributeError:
             return value
+        except ValueError:
+            # Multi-element arrays can't collapse to a scalar
+            return value.tolist() if isinstance(value, np.ndarray) else value
+    
+    def _driver_rows(self, results):
+        """Build the drivers upsert rows for a session's results frame in one pass"""
+        drivers = results[['DriverNumber', 'Abbreviation', 'FullName']].dropna(subset=['DriverNumber']).astype(str)
+        if drivers.empty:
+            return [], len(results)
+        
+        # Split full names into first and last with one vectorized pass
+        names = drivers['FullName'].str.partition(' ')
+        
+        rows = list(zip(
+            drivers['DriverNumber'], drivers['Abbreviation'], drivers['FullName'],
+            names[0], names[2], [True] * len(drivers)
+        ))
+        return rows, len(results) - len(drivers)
     
-    def store_driver_info(self, conn, driver_info, event_name):
-        """Store driver information in database - handles Oliver Bearman #38→#87 number change"""
+    def store_drivers(self, cur, results):
+        """Store a session's drivers in one batched upsert - handles Oliver Bearman #38→#87 number change
+        
+        Returns False if the drivers couldn't be stored.
+        """
         try:
-            # Convert numpy types to Python types
-            driver_number = self.convert_numpy_types(driver_info['DriverNumber'])
-            abbreviation = str(driver_info['Abbreviation'])
-            full_name = str(driver_info['FullName'])
+            rows, skipped = self._driver_rows(results)
+        except Exception as e:
+            print(f"❌ Error storing drivers: {e}")
+            return False
+        
+        if skipped:
+            print(f"⚠️ Skipped {skipped} driver record(s) with missing data")
+        if not rows:
+            return True
+        
+        try:
+            # Special handling for Oliver Bearman (BEA) permanent number assignment
+            if any(row[0] == '87' and row[1] == 'BEA' for row in rows):
+                self.logger.debug("Processing Oliver Bearman's permanent number: #87")
+                # Mark his old substitute numbers (38, 50) as inactive
+                cur.execute("""
+                    UPDATE drivers 
+                    SET is_active = false
+                    WHERE driver_code = 'BEA' AND driver_number IN ('38', '50')
+                """)
+                self.logger.debug("Deactivated Oliver's substitute numbers")
             
-            # Split full name into first and last
-            name_parts = full_name.split(' ', 1)
-            first_name = name_parts[0] if len(name_parts) > 0 else ''
-            last_name = name_parts[1] if len(name_parts) > 1 else ''
+            # Insert or update all drivers (works without unique constraint on driver_code)
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO drivers (driver_number, driver_code, full_name, first_name, last_name, is_active)
+                VALUES %s
+                ON CONFLICT (driver_number) DO UPDATE SET
+                    driver_code = EXCLUDED.driver_code,
+                    full_name = EXCLUDED.full_name,
+                    first_name = EXCLUDED.first_name,
+                    last_name = EXCLUDED.last_name,
+                    is_active = EXCLUDED.is_active
+            """, rows, page_size=200)
+            
+            print(f"✅ Stored {len(rows)} drivers")
+            self.logger.debug("Drivers: %s", ', '.join(row[1] for row in rows))
+            return True
             
-            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                # Special handling for Oliver Bearman (BEA) permanent number assignment
-                if abbreviation == 'BEA' and str(driver_number) == '87':
-                    print(f"   🏎️ Processing Oliver Bearman's permanent number: #87")
-                    # Mark his old substitute numbers (38, 50) as inactive
-                    cur.execute("""
-                        UPDATE drivers 
-                        SET is_active = false
-                        WHERE driver_code = 'BEA' AND driver_number IN ('38', '50')
-                    """)
-                    print(f"   📝 Deactivated Oliver's substitute numbers")
-                
-                # Insert or update driver (now works without unique constraint on driver_code)
-                cur.execute("""
-                    INSERT INTO drivers (driver_number, driver_code, full_name, first_name, last_name, is_active)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (driver_number) DO UPDATE SET
-                        driver_code = EXCLUDED.driver_code,
-                        full_name = EXCLUDED.full_name,
-                        first_name = EXCLUDED.first_name,
-                        last_name = EXCLUDED.last_name,
-                        is_active = EXCLUDED.is_active
-                """, (
-                    str(driver_number), 
-                    abbreviation, 
-                    full_name, 
-                    first_name, 
-                    last_name, 
-                    True
-                ))
-                
-                print(f"✅ Driver: {driver_number} - {full_name} ({abbreviation})")
-                
         except Exception as e:
-            print(f"❌ Error with driver {driver_number}: {e}")
-            # Don't raise - let processing continue with other drivers
-            pass
+            print(f"❌ Error storing drivers: {e}")
+            # Don't raise - let processing continue with lap times
+            return False
 
 def main():
     """Main function"""
@@ -2,42 +2,175 @@
 import fastf1
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import asyncio
-import aioredis
+import os
+from concurrent.futures import ThreadPoolExecutor
+from redis import asyncio as aioredis  # redis-py 4.2+ ships the aioredis API
 import json
 from datetime import datetime
 
+# Parsed sessions don't change once published, so cache them for a day
+SESSION_CACHE_TTL = 24 * 60 * 60
+
+# Sections of collected session data, in the order they're returned
+SESSION_SECTIONS = (
+    'session_info', 'drivers', 'telemetry', 'timing',
+    'weather', 'track_status', 'race_control', 'circuit_info'
+)
+
+# Per-lap fields reported for each driver, with defaults for missing columns
+DRIVER_LAP_COLUMNS = {
+    'LapNumber': None, 'LapTime': None, 'Sector1Time': None,
+    'Sector2Time': None, 'Sector3Time': None, 'SpeedI1': None,
+    'SpeedI2': None, 'SpeedFL': None, 'SpeedST': None,
+    'Compound': None, 'TyreLife': None, 'Stint': None,
+    'PitOutTime': None, 'PitInTime': None, 'IsPersonalBest': False
+}
+
+LAP_TIMEDELTA_COLUMNS = ('LapTime', 'Sector1Time', 'Sector2Time', 'Sector3Time', 'PitOutTime', 'PitInTime')
+
+def _json_default(value):
+    """JSON fallback for the numpy/pandas values left in collected data"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+def _telemetry_lists(telemetry: Optional[Dict]) -> Dict:
+    """Telemetry channels as plain lists, the same shape a cache hit decodes to"""
+    return {
+        driver_num: {channel: values.tolist() for channel, values in channels.items()}
+        for driver_num, channels in (telemetry or {}).items()
+    }
+
+def _select_columns(df: pd.DataFrame, defaults: Dict) -> pd.DataFrame:
+    """Select columns in order, filling any the frame doesn't have with a default"""
+    missing = {col: value for col, value in defaults.items() if col not in df.columns}
+    if missing:
+        df = df.assign(**missing)
+    return df[list(defaults)]
+
+def _channel(telemetry: pd.DataFrame, column: str, dtype=None) -> np.ndarray:
+    """Telemetry channel as a numpy array (empty if the channel is missing)
+    
+    Only pass a dtype for integer/boolean channels: float32 values print
+    with extra digits once serialized, which makes the JSON bigger.
+    """
+    if column not in telemetry.columns:
+        return np.array([], dtype=dtype or np.float64)
+    
+    values = telemetry[column].to_numpy()
+    # Integer channels with gaps can't hold NaN, so keep those as they are
+    if dtype is None or (np.dtype(dtype).kind in 'iu' and values.dtype.kind == 'f' and np.isnan(values).any()):
+        return values
+    return values.astype(dtype, copy=False)
+
 class SessionCollector:
-    def __init__(self, cache_dir: str = 'cache'):
+    def __init__(self, cache_dir: str = 'cache', redis_url: Optional[str] = None):
         self.cache_dir = cache_dir
         fastf1.Cache.enable_cache(cache_dir)
+        self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self.redis_url = redis_url or os.getenv('REDIS_URL')
+        self._redis = None
+        # Circuit layout doesn't change between sessions of the same event
+        self._circuit_info_cache: Dict[Tuple[int, int], Dict] = {}
         
+    def _get_redis(self):
+        """Redis client for the session cache, created on first use"""
+        if self._redis is None and self.redis_url:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+    
+    async def _get_cached_session(self, key: str) -> Optional[Dict]:
+        """Return previously collected session data, if cached"""
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            cached = await redis.get(key)
+            return json.loads(cached) if cached is not None else None
+        except Exception as e:
+            print(f"Error reading session cache: {e}")
+            return None
+    
+    async def _cache_session(self, key: str, data: Dict):
+        """Store collected session data for later calls"""
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(key, json.dumps(data, default=_json_default), ex=SESSION_CACHE_TTL)
+        except Exception as e:
+            print(f"Error writing session cache: {e}")
+    
     async def collect_session_data(self, year: int, round_num: int, session: str) -> Dict:
         """Collect comprehensive session data"""
+        cache_key = f"f1:session:{year}:{round_num}:{session}"
+        cached = await self._get_cached_session(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Load session
-            session_obj = fastf1.get_session(year, round_num, session)
-            session_obj.load()
-            
-            # Collect all data
-            data = {
-                'session_info': self._get_session_info(session_obj),
-                'drivers': self._get_drivers_data(session_obj),
-                'telemetry': self._get_telemetry_data(session_obj),
-                'timing': self._get_timing_data(session_obj),
-                'weather': self._get_weather_data(session_obj),
-                'track_status': self._get_track_status(session_obj),
-                'race_control': self._get_race_control_messages(session_obj),
-                'circuit_info': self._get_circuit_info(session_obj)
-            }
+            # Keep the usual section order whichever section finishes first
+            data = dict.fromkeys(SESSION_SECTIONS)
+            async for section, payload in self.stream_session_data(year, round_num, session):
+                data[section] = payload
+            # Return lists on a miss too, so callers see one type either way
+            data['telemetry'] = _telemetry_lists(data['telemetry'])
             
+            await self._cache_session(cache_key, data)
             return data
             
         except Exception as e:
             print(f"Error collecting session data: {e}")
             return {}
     
+    async def stream_session_data(self, year: int, round_num: int, session: str) -> AsyncIterator[Tuple[str, object]]:
+        """Yield (section, payload) pairs as each part of the session is extracted"""
+        # Load session
+        session_obj = fastf1.get_session(year, round_num, session)
+        session_obj.load()
+        
+        # The extractors read disjoint parts of the session, so run them
+        # alongside the per-driver work on the executor
+        extractors = {
+            'session_info': self._get_session_info,
+            'timing': self._get_timing_data,
+            'weather': self._get_weather_data,
+            'track_status': self._get_track_status,
+            'race_control': self._get_race_control_messages,
+            'circuit_info': self._get_circuit_info
+        }
+        # Own the tasks so they can be cancelled if the consumer stops early
+        # or one of the sections fails
+        tasks = [asyncio.ensure_future(self._driver_sections(session_obj))] + [
+            asyncio.ensure_future(self._extract_section(section, extractor, session_obj))
+            for section, extractor in extractors.items()
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for section, payload in await next_done:
+                    yield section, payload
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _extract_section(self, section: str, extractor, session) -> List[Tuple[str, object]]:
+        """Run one extractor on the executor"""
+        loop = asyncio.get_running_loop()
+        return [(section, await loop.run_in_executor(self.executor, extractor, session))]
+    
+    async def _driver_sections(self, session) -> List[Tuple[str, object]]:
+        """Per-driver lap and telemetry sections"""
+        drivers_data, telemetry_data = await self._collect_driver_data(session)
+        return [('drivers', drivers_data), ('telemetry', telemetry_data)]
+    
     def _get_session_info(self, session) -> Dict:
         """Extract session information"""
         return {
@@ -51,165 +184,226 @@ class SessionCollector:
             'total_laps': len(session.laps) if hasattr(session, 'laps') else 0
         }
     
-    def _get_drivers_data(self, session) -> Dict:
-        """Extract driver data with results and lap times"""
-        drivers_data = {}
+    async def _collect_driver_data(self, session) -> Tuple[Dict, Dict]:
+        """Extract per-driver lap and telemetry data, one driver per worker thread"""
+        # Read the session's laps and drivers once and hand them to every worker
+        laps = session.laps
+        drivers = [str(driver_num) for driver_num in session.drivers]
         
-        for driver_num in session.drivers:
-            try:
-                driver_info = session.get_driver(driver_num)
-                driver_laps = session.laps.pick_driver(driver_num)
-                
-                # Process lap data
-                laps_list = []
-                for _, lap in driver_laps.iterrows():
-                    lap_data = {
-                        'lap_number': int(lap['LapNumber']),
-                        'lap_time': lap['LapTime'].total_seconds() if pd.notna(lap['LapTime']) else None,
-                        'sector1_time': lap['Sector1Time'].total_seconds() if pd.notna(lap['Sector1Time']) else None,
-                        'sector2_time': lap['Sector2Time'].total_seconds() if pd.notna(lap['Sector2Time']) else None,
-                        'sector3_time': lap['Sector3Time'].total_seconds() if pd.notna(lap['Sector3Time']) else None,
-                        'speed_i1': lap.get('SpeedI1'),
-                        'speed_i2': lap.get('SpeedI2'),
-                        'speed_fl': lap.get('SpeedFL'),
-                        'speed_st': lap.get('SpeedST'),
-                        'compound': lap.get('Compound'),
-                        'tyre_life': lap.get('TyreLife'),
-                        'stint': lap.get('Stint'),
-                        'pit_out_time': lap['PitOutTime'].total_seconds() if pd.notna(lap['PitOutTime']) else None,
-                        'pit_in_time': lap['PitInTime'].total_seconds() if pd.notna(lap['PitInTime']) else None,
-                        'is_personal_best': lap.get('IsPersonalBest', False)
-                    }
-                    laps_list.append(lap_data)
-                
-                drivers_data[str(driver_num)] = {
-                    'driver_number': str(driver_num),
-                    'name': driver_info.get('FullName', f'Driver {driver_num}'),
-                    'abbreviation': driver_info.get('Abbreviation', str(driver_num)),
-                    'team': driver_info.get('TeamName', 'Unknown'),
-                    'team_color': driver_info.get('TeamColor', '#000000'),
-                    'country_code': driver_info.get('CountryCode', ''),
-                    'laps': laps_list,
-                    'fastest_lap': min([l['lap_time'] for l in laps_list if l['lap_time']], default=None)
-                }
-                
-            except Exception as e:
-                print(f"Error processing driver {driver_num}: {e}")
-                continue
+        # Convert lap times to seconds once for the whole session
+        seconds = self._lap_seconds(laps)
+        lap_rows = seconds.astype(object).where(seconds.notna(), None)
         
-        return drivers_data
-    
-    def _get_telemetry_data(self, session) -> Dict:
-        """Extract telemetry data for fastest laps"""
+        # Every driver's fastest lap from one column reduction
+        fastest_laps = seconds['LapTime'].groupby(laps['DriverNumber'], sort=False).min().dropna().to_dict()
+        
+        # Driver metadata from one pass over the results frame, instead of a
+        # get_driver lookup per driver
+        driver_meta = {str(info['DriverNumber']): info for info in session.results.to_dict('records')}
+        
+        # Row positions of each driver's laps from one groupby pass, instead of
+        # a pick_driver scan of the whole frame per driver
+        driver_positions = laps.groupby('DriverNumber', sort=False).indices
+        no_laps = np.array([], dtype=np.intp)
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(
+                self.executor, self._process_driver, driver_meta, laps, lap_rows,
+                driver_num, driver_positions.get(driver_num, no_laps), fastest_laps.get(driver_num)
+            )
+            for driver_num in drivers
+        ])
+        
+        drivers_data = {}
         telemetry_data = {}
+        for driver_num, (driver_data, telemetry) in zip(drivers, results):
+            if driver_data is not None:
+                drivers_data[driver_num] = driver_data
+            if telemetry is not None:
+                telemetry_data[driver_num] = telemetry
         
-        for driver_num in session.drivers:
-            try:
-                driver_laps = session.laps.pick_driver(driver_num)
-                if not driver_laps.empty:
-                    fastest_lap = driver_laps.pick_fastest()
-                    if fastest_lap is not None:
-                        telemetry = fastest_lap.get_telemetry()
-                        if not telemetry.empty:
-                            telemetry_data[str(driver_num)] = {
-                                'distance': telemetry['Distance'].tolist(),
-                                'speed': telemetry['Speed'].tolist(),
-                                'rpm': telemetry.get('RPM', []).tolist() if 'RPM' in telemetry.columns else [],
-                                'gear': telemetry.get('nGear', []).tolist() if 'nGear' in telemetry.columns else [],
-                                'throttle': telemetry.get('Throttle', []).tolist() if 'Throttle' in telemetry.columns else [],
-                                'brake': telemetry.get('Brake', []).tolist() if 'Brake' in telemetry.columns else [],
-                                'x': telemetry.get('X', []).tolist() if 'X' in telemetry.columns else [],
-                                'y': telemetry.get('Y', []).tolist() if 'Y' in telemetry.columns else []
-                            }
-            except Exception as e:
-                print(f"Error processing telemetry for driver {driver_num}: {e}")
-                continue
-        
-        return telemetry_data
+        return drivers_data, telemetry_data
+    
+    def _lap_seconds(self, laps) -> pd.DataFrame:
+        """Driver lap columns with Timedeltas converted to float seconds"""
+        frame = _select_columns(laps, DRIVER_LAP_COLUMNS)
+        return frame.assign(**{
+            col: pd.to_timedelta(frame[col]).dt.total_seconds() for col in LAP_TIMEDELTA_COLUMNS
+        })
+    
+    def _process_driver(self, driver_meta, laps, lap_rows, driver_num, positions,
+                        fastest_lap) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Build one driver's lap data and fastest-lap telemetry"""
+        try:
+            driver_laps = laps.iloc[positions]
+        except Exception as e:
+            print(f"Error processing driver {driver_num}: {e}")
+            return None, None
+        
+        return (
+            self._get_driver_data(driver_meta, driver_num, lap_rows.iloc[positions], fastest_lap),
+            self._get_driver_telemetry(driver_num, driver_laps)
+        )
+    
+    def _get_driver_data(self, driver_meta, driver_num, driver_lap_rows, fastest_lap) -> Optional[Dict]:
+        """Extract driver data with results and lap times"""
+        try:
+            driver_info = driver_meta[driver_num]
+            
+            # Times are already seconds (or None)
+            laps_list = []
+            for (lap_number, lap_time, sector1, sector2, sector3, speed_i1, speed_i2,
+                 speed_fl, speed_st, compound, tyre_life, stint, pit_out, pit_in,
+                 is_personal_best) in driver_lap_rows.itertuples(index=False, name=None):
+                lap_data = {
+                    'lap_number': int(lap_number),
+                    'lap_time': lap_time,
+                    'sector1_time': sector1,
+                    'sector2_time': sector2,
+                    'sector3_time': sector3,
+                    'speed_i1': speed_i1,
+                    'speed_i2': speed_i2,
+                    'speed_fl': speed_fl,
+                    'speed_st': speed_st,
+                    'compound': compound,
+                    'tyre_life': tyre_life,
+                    'stint': stint,
+                    'pit_out_time': pit_out,
+                    'pit_in_time': pit_in,
+                    'is_personal_best': is_personal_best
+                }
+                laps_list.append(lap_data)
+            
+            return {
+                'driver_number': driver_num,
+                'name': driver_info.get('FullName', f'Driver {driver_num}'),
+                'abbreviation': driver_info.get('Abbreviation', driver_num),
+                'team': driver_info.get('TeamName', 'Unknown'),
+                'team_color': driver_info.get('TeamColor', '#000000'),
+                'country_code': driver_info.get('CountryCode', ''),
+                'laps': laps_list,
+                'fastest_lap': fastest_lap
+            }
+            
+        except Exception as e:
+            print(f"Error processing driver {driver_num}: {e}")
+            return None
+    
+    def _get_driver_telemetry(self, driver_num, driver_laps) -> Optional[Dict]:
+        """Extract telemetry data for a driver's fastest lap"""
+        try:
+            if driver_laps.empty:
+                return None
+            fastest_lap = driver_laps.pick_fastest()
+            if fastest_lap is None:
+                return None
+            telemetry = fastest_lap.get_telemetry()
+            if telemetry.empty:
+                return None
+            
+            # Keep channels as numpy arrays while streaming; collect_session_data
+            # turns them into lists (see _telemetry_lists)
+            return {
+                'distance': _channel(telemetry, 'Distance'),
+                'speed': _channel(telemetry, 'Speed'),
+                'rpm': _channel(telemetry, 'RPM'),
+                'gear': _channel(telemetry, 'nGear', np.int8),
+                'throttle': _channel(telemetry, 'Throttle'),
+                'brake': _channel(telemetry, 'Brake', np.bool_),
+                'x': _channel(telemetry, 'X'),
+                'y': _channel(telemetry, 'Y')
+            }
+        except Exception as e:
+            print(f"Error processing telemetry for driver {driver_num}: {e}")
+            return None
     
     def _get_timing_data(self, session) -> List[Dict]:
         """Extract timing data"""
-        if not hasattr(session, 'laps') or session.laps.empty:
+        laps = getattr(session, 'laps', None)
+        if laps is None or laps.empty:
             return []
         
-        timing_data = []
-        for _, lap in session.laps.iterrows():
-            timing_data.append({
-                'driver': str(lap['DriverNumber']),
-                'lap_number': int(lap['LapNumber']),
-                'time': lap['Time'].total_seconds() if pd.notna(lap['Time']) else None,
-                'lap_time': lap['LapTime'].total_seconds() if pd.notna(lap['LapTime']) else None,
-                'position': lap.get('Position')
-            })
+        laps = _select_columns(laps, {
+            'DriverNumber': None, 'LapNumber': None, 'Time': None, 'LapTime': None, 'Position': None
+        })
         
-        return timing_data
+        # Convert whole columns at once; NaN/NaT become None for JSON
+        timing = pd.DataFrame({
+            'driver': laps['DriverNumber'].astype(str),
+            'lap_number': laps['LapNumber'].astype('Int64'),
+            'time': laps['Time'].dt.total_seconds(),
+            'lap_time': laps['LapTime'].dt.total_seconds(),
+            'position': laps['Position']
+        })
+        return timing.astype(object).where(timing.notna(), None).to_dict('records')
     
     def _get_weather_data(self, session) -> List[Dict]:
         """Extract weather data"""
-        if not hasattr(session, 'weather_data') or session.weather_data.empty:
+        weather = getattr(session, 'weather_data', None)
+        if weather is None or weather.empty:
             return []
         
-        weather_list = []
-        for _, weather in session.weather_data.iterrows():
-            weather_list.append({
-                'time': weather['Time'].total_seconds() if pd.notna(weather['Time']) else None,
-                'air_temp': weather.get('AirTemp'),
-                'track_temp': weather.get('TrackTemp'),
-                'humidity': weather.get('Humidity'),
-                'pressure': weather.get('Pressure'),
-                'wind_direction': weather.get('WindDirection'),
-                'wind_speed': weather.get('WindSpeed'),
-                'rainfall': weather.get('Rainfall')
-            })
-        
-        return weather_list
+        weather = _select_columns(weather, {
+            'Time': None, 'AirTemp': None, 'TrackTemp': None, 'Humidity': None,
+            'Pressure': None, 'WindDirection': None, 'WindSpeed': None, 'Rainfall': None
+        })
+        weather = weather.assign(Time=weather['Time'].dt.total_seconds())
+        weather.columns = [
+            'time', 'air_temp', 'track_temp', 'humidity',
+            'pressure', 'wind_direction', 'wind_speed', 'rainfall'
+        ]
+        return weather.astype(object).where(weather.notna(), None).to_dict('records')
     
     def _get_track_status(self, session) -> List[Dict]:
         """Extract track status information"""
-        if not hasattr(session, 'track_status') or session.track_status.empty:
+        track_status = getattr(session, 'track_status', None)
+        if track_status is None or track_status.empty:
             return []
         
-        status_list = []
-        for _, status in session.track_status.iterrows():
-            status_list.append({
-                'time': status['Time'].total_seconds() if pd.notna(status['Time']) else None,
-                'status': status.get('Status'),
-                'message': status.get('Message', '')
-            })
+        track_status = _select_columns(track_status, {
+            'Time': None, 'Status': None, 'Message': ''
+        })
         
-        return status_list
+        # Convert and None-mask whole columns instead of testing each row
+        track_status = track_status.assign(Time=pd.to_timedelta(track_status['Time']).dt.total_seconds())
+        track_status.columns = ['time', 'status', 'message']
+        return track_status.astype(object).where(track_status.notna(), None).to_dict('records')
     
     def _get_race_control_messages(self, session) -> List[Dict]:
         """Extract race control messages"""
-        if not hasattr(session, 'race_control_messages') or session.race_control_messages.empty:
+        messages = getattr(session, 'race_control_messages', None)
+        if messages is None or messages.empty:
             return []
         
-        messages_list = []
-        for _, message in session.race_control_messages.iterrows():
-            messages_list.append({
-                'time': message['Time'].isoformat() if pd.notna(message['Time']) else None,
-                'category': message.get('Category', ''),
-                'message': message.get('Message', ''),
-                'status': message.get('Status', ''),
-                'flag': message.get('Flag', ''),
-                'scope': message.get('Scope', '')
-            })
+        messages = _select_columns(messages, {
+            'Time': None, 'Category': '', 'Message': '', 'Status': '', 'Flag': '', 'Scope': ''
+        })
         
-        return messages_list
+        # Only the non-null timestamps are formatted; NaN/NaT become None below
+        messages = messages.assign(Time=messages['Time'].map(pd.Timestamp.isoformat, na_action='ignore'))
+        messages.columns = ['time', 'category', 'message', 'status', 'flag', 'scope']
+        return messages.astype(object).where(messages.notna(), None).to_dict('records')
     
     def _get_circuit_info(self, session) -> Dict:
-        """Extract circuit information"""
+        """Extract circuit information (shared by every session of an event)"""
         try:
+            event_key = (session.event.year, session.event['RoundNumber'])
+            if event_key in self._circuit_info_cache:
+                return self._circuit_info_cache[event_key]
+            
             circuit_info = session.get_circuit_info()
             if circuit_info is None:
                 return {}
             
-            return {
+            info = {
                 'corners': circuit_info.corners.to_dict('records') if hasattr(circuit_info, 'corners') else [],
                 'marshal_lights': circuit_info.marshal_lights.to_dict('records') if hasattr(circuit_info, 'marshal_lights') else [],
                 'marshal_sectors': circuit_info.marshal_sectors.to_dict('records') if hasattr(circuit_info, 'marshal_sectors') else [],
                 'rotation': getattr(circuit_info, 'rotation', 0)
             }
+            self._circuit_info_cache[event_key] = info
+            return info
         except Exception as e:
             print(f"Error getting circuit info: {e}")
             return {}
\ No newline at end of file